@@ -1,12 +1,27 @@
 import re
+import asyncio
 import PyPDF2
 from docx import Document
 from io import BytesIO
+from collections import Counter
 from typing import Dict, List, Any, Tuple
 import json
 import os
+import string
 import requests
 
+try:
+    # RE2 scans in linear time with no backtracking; fall back to the stdlib engine if it isn't installed
+    import re2 as regex_engine
+except ImportError:
+    regex_engine = re
+
+SEVERITY_SCORES = {"low": 1, "medium": 2, "high": 3}
+MONETARY_PATTERN = re.compile(r'\$[\d,]+')
+ASCII_LOWERCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+# Characters of surrounding text kept on each side of a match
+CLAUSE_CONTEXT = 100
+
 class EnhancedContractAnalyzer:
     def __init__(self):
         # Configure Hugging Face
@@ -165,6 +180,43 @@ class EnhancedContractAnalyzer:
                 "weight": 2
             }
         }
+        
+        # Compile every pattern once so each analysis only scans, never recompiles.
+        # Patterns are lowercase and run against lowercased content instead of case-insensitively.
+        self.compiled_risk_patterns = {
+            risk_type: [regex_engine.compile(pattern) for pattern in config["patterns"]]
+            for risk_type, config in self.risk_patterns.items()
+        }
+        self.compiled_compliance_patterns = {
+            compliance_type: [regex_engine.compile(pattern) for pattern in config["patterns"]]
+            for compliance_type, config in self.compliance_patterns.items()
+        }
+        
+        # Per-category values that are the same for every match
+        self.risk_pattern_scores = {
+            risk_type: config["weight"] * SEVERITY_SCORES[config["severity"]]
+            for risk_type, config in self.risk_patterns.items()
+        }
+        self.risk_fields = {
+            risk_type: (
+                config["category"],
+                config["severity"],
+                f"Potential {config['category'].lower()} risk detected",
+                self.risk_pattern_scores[risk_type],
+                self._generate_recommendation(config["category"], config["severity"])
+            )
+            for risk_type, config in self.risk_patterns.items()
+        }
+        self.compliance_fields = {
+            compliance_type: (
+                config["regulation"],
+                config["status"],
+                f"Potential {config['regulation']} compliance requirement",
+                config["weight"],
+                f"Review {config['regulation']} compliance requirements with legal counsel"
+            )
+            for compliance_type, config in self.compliance_patterns.items()
+        }
 
     def parse_pdf(self, file_content: bytes) -> str:
         """Extract text from PDF files"""
@@ -318,10 +370,19 @@ class EnhancedContractAnalyzer:
             raise Exception(f"OpenRouter API error: {error_message}")
         return result["choices"][0]["message"]["content"]
 
-    async def analyze_risks_with_ai(self, content: str) -> tuple[list[dict], int]:
-        """Analyze risks using OpenRouter LLM with fallback to pattern matching"""
+    async def warmup(self) -> None:
+        """Run the pattern scans once so the first request doesn't pay regex start-up costs"""
+        sample = "This is a test contract. Payment is due within 30 days. Personal data processing applies."
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.analyze_risks, sample)
+        await loop.run_in_executor(None, self.analyze_compliance, sample)
+
+    async def analyze_risks_with_ai(self, content: str) -> tuple[list[dict], int, bool]:
+        """Analyze risks using OpenRouter LLM with fallback to pattern matching (the flag is False on fallback)"""
+        # The HTTP call and the regex scan are both blocking, so run them off the event loop
+        loop = asyncio.get_running_loop()
         try:
-            analysis_text = self.analyze_with_openrouter(content)
+            analysis_text = await loop.run_in_executor(None, self.analyze_with_openrouter, content)
             # You can parse the analysis_text for risks, compliance, etc., or just return as summary
             # For now, return as a single summary risk
             risks = [{
@@ -332,68 +393,78 @@ class EnhancedContractAnalyzer:
                 "recommendation": "Review the LLM-generated analysis above."
             }]
             risk_score = 10  # You can improve this by parsing the text for severity
-            return risks, risk_score
+            return risks, risk_score, True
         except Exception as e:
             print(f"OpenRouter analysis failed: {str(e)}")
-            return self.analyze_risks(content)
+            risks, risk_score = await loop.run_in_executor(None, self.analyze_risks, content)
+            return risks, risk_score, False
+
+    def _scan_patterns(self, content: str, compiled_patterns: Dict[str, List[Any]]) -> List[Tuple[int, int, str]]:
+        """Scan content with every compiled pattern, returning (start, end, pattern key) offsets"""
+        # Only offsets are kept here; text is sliced once when result items are built.
+        # Each pattern scans separately so overlapping matches from different patterns all count.
+        lowered = content.lower()
+        if len(lowered) != len(content):
+            # A few non-ASCII characters lowercase to several characters; lowercase ASCII only so offsets line up
+            lowered = content.translate(ASCII_LOWERCASE)
+        
+        hits = []
+        for key, patterns in compiled_patterns.items():
+            for pattern in patterns:
+                hits.extend((match.start(), match.end(), key) for match in pattern.finditer(lowered))
+        return hits
 
     def analyze_risks(self, content: str) -> Tuple[List[Dict], int]:
         """Enhanced risk analysis with sophisticated detection"""
-        risks = []
-        total_risk_score = 0
+        hits = self._scan_patterns(content, self.compiled_risk_patterns)
         
-        for risk_type, config in self.risk_patterns.items():
-            for pattern in config["patterns"]:
-                matches = re.finditer(pattern, content, re.IGNORECASE)
-                for match in matches:
-                    # Extract context around the match
-                    start = max(0, match.start() - 100)
-                    end = min(len(content), match.end() + 100)
-                    context = content[start:end].strip()
-                    
-                    # Calculate risk score based on pattern weight and severity
-                    severity_score = {"low": 1, "medium": 2, "high": 3}[config["severity"]]
-                    pattern_score = config["weight"] * severity_score
-                    total_risk_score += pattern_score
-                    
-                    # Extract monetary amounts if present
-                    monetary_match = re.search(r'\$[\d,]+', match.group(0))
-                    monetary_value = monetary_match.group(0) if monetary_match else None
-                    
-                    risks.append({
-                        "category": config["category"],
-                        "severity": config["severity"],
-                        "description": f"Potential {config['category'].lower()} risk detected",
-                        "clause": context,
-                        "pattern_matched": match.group(0),
-                        "monetary_value": monetary_value,
-                        "risk_score": pattern_score,
-                        "recommendation": self._generate_recommendation(config["category"], config["severity"])
-                    })
+        # Total score is hits per risk type times that type's score
+        hit_counts = Counter(risk_type for _, _, risk_type in hits)
+        total_risk_score = sum(self.risk_pattern_scores[risk_type] * count for risk_type, count in hit_counts.items())
+        
+        risk_fields = self.risk_fields
+        
+        risks = []
+        for match_start, match_end, risk_type in hits:
+            category, severity, description, pattern_score, recommendation = risk_fields[risk_type]
+            matched = content[match_start:match_end]
+            
+            # Extract monetary amounts if present
+            monetary_match = MONETARY_PATTERN.search(matched)
+            
+            risks.append({
+                "category": category,
+                "severity": severity,
+                "description": description,
+                # Slicing past the end is safe, so only the start of the window needs clamping
+                "clause": content[max(match_start - CLAUSE_CONTEXT, 0):match_end + CLAUSE_CONTEXT].strip(),
+                "pattern_matched": matched,
+                "monetary_value": monetary_match.group(0) if monetary_match else None,
+                "risk_score": pattern_score,
+                "recommendation": recommendation
+            })
         
         return risks, total_risk_score
 
     def analyze_compliance(self, content: str) -> List[Dict]:
         """Enhanced compliance analysis"""
-        compliance_issues = []
+        hits = self._scan_patterns(content, self.compiled_compliance_patterns)
         
-        for compliance_type, config in self.compliance_patterns.items():
-            for pattern in config["patterns"]:
-                matches = re.finditer(pattern, content, re.IGNORECASE)
-                for match in matches:
-                    start = max(0, match.start() - 100)
-                    end = min(len(content), match.end() + 100)
-                    context = content[start:end].strip()
-                    
-                    compliance_issues.append({
-                        "regulation": config["regulation"],
-                        "status": config["status"],
-                        "description": f"Potential {config['regulation']} compliance requirement",
-                        "clause": context,
-                        "pattern_matched": match.group(0),
-                        "weight": config["weight"],
-                        "recommendation": f"Review {config['regulation']} compliance requirements with legal counsel"
-                    })
+        compliance_fields = self.compliance_fields
+        
+        compliance_issues = []
+        for match_start, match_end, compliance_type in hits:
+            regulation, status, description, weight, recommendation = compliance_fields[compliance_type]
+            
+            compliance_issues.append({
+                "regulation": regulation,
+                "status": status,
+                "description": description,
+                "clause": content[max(match_start - CLAUSE_CONTEXT, 0):match_end + CLAUSE_CONTEXT].strip(),
+                "pattern_matched": content[match_start:match_end],
+                "weight": weight,
+                "recommendation": recommendation
+            })
         
         return compliance_issues
 
@@ -1,19 +1,165 @@
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY, TA_RIGHT
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 from io import BytesIO
 from datetime import datetime
-from typing import Dict, List, Any
-import json
-import re
+from html import escape
+from typing import Dict, List, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from collections import Counter
+from reportlab_accel import check_rl_accel
+
+check_rl_accel()
+
+STATUS_ICON = {"warning": "⚠️", "critical": "❌"}
+STATUS_ICON_DEFAULT = "✅"
+
+RISK_COLORS = {
+    'CRITICAL': 'red',
+    'HIGH': 'orange',
+    'MEDIUM': 'yellow',
+    'LOW': 'green',
+    'MINIMAL': 'blue'
+}
+
+SEVERITY_COLORS = {
+    'high': 'red',
+    'medium': 'orange',
+    'low': 'green'
+}
+
+RISK_DESCRIPTIONS = {
+    'CRITICAL': 'Immediate legal review required. Significant risks present.',
+    'HIGH': 'Extensive negotiations recommended. Multiple concerning terms.',
+    'MEDIUM': 'Some negotiation needed. Standard contract with risks.',
+    'LOW': 'Generally acceptable terms. Minor improvements possible.',
+    'MINIMAL': 'Very low risk. Standard contract terms.'
+}
+
+@dataclass(frozen=True, slots=True)
+class ReportContext:
+    """Per-report values shared by the PDF section builders"""
+    filename: str
+    analysis_id: str
+    risk_level: str
+    risk_score: int
+    risks: List[Dict[str, Any]]
+    compliance: List[Dict[str, Any]]
+    buckets: Dict[str, List[Dict[str, Any]]]  # risks grouped by severity
+    now_full: str
+    now_date: str
+    now_iso: str
+
+SPECIFIC_ACTIONS = (
+    "Review all high-risk items with legal counsel",
+    "Negotiate liability caps and indemnification terms",
+    "Ensure payment terms are reasonable and achievable",
+    "Verify compliance with applicable regulations",
+    "Request clarification on ambiguous terms",
+    "Consider insurance requirements for high-risk contracts",
+    "Document all negotiations and changes"
+)
+
+_URGENT_NEXT_STEPS = (
+    "Schedule immediate legal review",
+    "Prepare negotiation strategy",
+    "Identify deal-breaker terms",
+    "Consider alternative suppliers/vendors"
+)
+
+NEXT_STEPS = {
+    'CRITICAL': _URGENT_NEXT_STEPS,
+    'HIGH': _URGENT_NEXT_STEPS,
+    'MEDIUM': (
+        "Prioritize high-risk items for negotiation",
+        "Prepare counter-proposals",
+        "Set negotiation timeline",
+        "Identify acceptable compromises"
+    )
+}
+NEXT_STEPS_DEFAULT = (
+    "Review terms with stakeholders",
+    "Prepare minor negotiation requests",
+    "Set signing timeline",
+    "Plan implementation"
+)
+
+# (heading, text) pairs shared by the PDF and HTML reports
+_AGGRESSIVE_STRATEGY = (
+    "🚨 High-Risk Contract - Aggressive Negotiation Required",
+    "This contract contains significant risks that require immediate attention. "
+    "Consider requesting substantial modifications or walking away if terms cannot be improved."
+)
+
+NEGOTIATION_STRATEGIES = {
+    'CRITICAL': _AGGRESSIVE_STRATEGY,
+    'HIGH': _AGGRESSIVE_STRATEGY,
+    'MEDIUM': (
+        "⚖️ Medium-Risk Contract - Balanced Negotiation Approach",
+        "This contract has some concerning terms but is generally negotiable. "
+        "Focus on the highest-risk items while accepting reasonable terms on others."
+    )
+}
+NEGOTIATION_STRATEGY_DEFAULT = (
+    "✅ Low-Risk Contract - Standard Negotiation",
+    "This contract appears to have reasonable terms. Focus on minor improvements "
+    "and ensuring all terms are clearly understood."
+)
+
+_URGENT_RECOMMENDATION = (
+    "🚨 IMMEDIATE ACTION REQUIRED",
+    "This contract presents significant legal and financial risks. "
+    "We strongly recommend extensive negotiations or reconsideration of the agreement."
+)
+
+OVERALL_RECOMMENDATIONS = {
+    'CRITICAL': _URGENT_RECOMMENDATION,
+    'HIGH': _URGENT_RECOMMENDATION,
+    'MEDIUM': (
+        "⚖️ NEGOTIATION RECOMMENDED",
+        "This contract has some concerning terms that should be addressed "
+        "before signing. Focus on the highest-risk items."
+    )
+}
+OVERALL_RECOMMENDATION_DEFAULT = (
+    "✅ GENERALLY ACCEPTABLE",
+    "This contract appears to have reasonable terms. "
+    "Minor negotiations may be beneficial but are not critical."
+)
+
+DISCLAIMER = (
+    "This analysis is provided for informational purposes only and does not constitute legal advice. "
+    "Always consult with qualified legal counsel before making decisions based on this analysis. "
+    "The analysis is based on automated review and may not capture all nuances of complex legal documents."
+)
+
+# Generator reused by every job in a report worker process
+_worker_generator = None
+
+def init_report_worker() -> None:
+    """Create the report generator a worker process reuses for every job"""
+    global _worker_generator
+    _worker_generator = EnhancedContractReportGenerator()
+
+def render_pdf_report(analysis_data: Dict[str, Any], filename: str) -> bytes:
+    """Build one PDF report inside a worker process"""
+    if _worker_generator is None:
+        init_report_worker()
+    return _worker_generator.generate_pdf_report(analysis_data, filename).getvalue()
+
+def _worker_generate(item: Tuple[Dict[str, Any], str]) -> bytes:
+    """Build one (analysis_data, filename) report inside a worker process"""
+    return render_pdf_report(*item)
 
 class EnhancedContractReportGenerator:
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
+        self._setup_table_styles()
         self._setup_negotiation_guidance()
     
     def _setup_custom_styles(self):
@@ -122,6 +268,55 @@ class EnhancedContractReportGenerator:
             fontName='Helvetica-Bold'
         ))
 
+    def _setup_table_styles(self):
+        """Setup table styles shared by every report"""
+        # Title page document info
+        self._title_table_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ])
+        
+        # Executive summary key findings
+        self._findings_table_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('BACKGROUND', (0, 1), (-1, 1), colors.lightcoral),
+            ('BACKGROUND', (0, 2), (-1, 2), colors.lightyellow),
+            ('BACKGROUND', (0, 3), (-1, 3), colors.lightgreen),
+        ])
+        
+        # Contract overview risk distribution
+        self._category_table_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ])
+        
+        # Technical details metadata
+        self._tech_table_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ])
+
     def _setup_negotiation_guidance(self):
         """Setup negotiation guidance for different contract terms"""
         self.negotiation_guidance = {
@@ -225,51 +420,242 @@ class EnhancedContractReportGenerator:
 
     def generate_pdf_report(self, analysis_data: Dict[str, Any], filename: str) -> BytesIO:
         """Generate a comprehensive PDF report with detailed analysis"""
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=50, leftMargin=50, topMargin=50, bottomMargin=50)
-        
-        story = []
-        
-        # Title page
-        story.extend(self._create_title_page(analysis_data, filename))
-        story.append(PageBreak())
-        
-        # Table of Contents (simplified)
-        story.extend(self._create_table_of_contents())
-        story.append(PageBreak())
+        ctx = self._build_context(analysis_data, filename)
         
-        # Executive Summary
-        story.extend(self._create_executive_summary(analysis_data))
-        story.append(PageBreak())
-        
-        # Contract Overview
-        story.extend(self._create_contract_overview(analysis_data, filename))
-        story.append(PageBreak())
-        
-        # Detailed Risk Analysis
-        story.extend(self._create_detailed_risk_analysis(analysis_data))
-        story.append(PageBreak())
-        
-        # Compliance Analysis
-        story.extend(self._create_compliance_analysis(analysis_data))
-        story.append(PageBreak())
-        
-        # Negotiation Strategy
-        story.extend(self._create_negotiation_strategy(analysis_data))
-        story.append(PageBreak())
-        
-        # Recommendations
-        story.extend(self._create_recommendations(analysis_data))
-        story.append(PageBreak())
+        buffer = BytesIO()
+        # Compress page streams so less data is copied when the PDF body is assembled
+        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=50, leftMargin=50, topMargin=50, bottomMargin=50,
+                                pageCompression=1)
+        
+        sections = [
+            # Title page
+            self._create_title_page(ctx),
+            # Table of Contents (simplified)
+            self._create_table_of_contents(ctx),
+            # Executive Summary
+            self._create_executive_summary(ctx),
+            # Contract Overview
+            self._create_contract_overview(ctx),
+        ]
         
-        # Technical Details
-        story.extend(self._create_technical_details(analysis_data))
+        # Empty risk/compliance sections are skipped rather than laid out as placeholder pages
+        if ctx.risks:
+            # Detailed Risk Analysis
+            sections.append(self._create_detailed_risk_analysis(ctx))
+        if ctx.compliance:
+            # Compliance Analysis
+            sections.append(self._create_compliance_analysis(ctx))
+        
+        sections.extend([
+            # Negotiation Strategy
+            self._create_negotiation_strategy(ctx),
+            # Recommendations
+            self._create_recommendations(ctx),
+            # Technical Details
+            self._create_technical_details(ctx),
+        ])
+        
+        # Size the story once (sections plus a PageBreak between each) instead of growing it
+        story = [None] * (sum(map(len, sections)) + len(sections) - 1)
+        pos = 0
+        for i, section in enumerate(sections):
+            if i:
+                story[pos] = PageBreak()
+                pos += 1
+            story[pos:pos + len(section)] = section
+            pos += len(section)
         
         doc.build(story)
         buffer.seek(0)
         return buffer
 
-    def _create_title_page(self, analysis_data: Dict[str, Any], filename: str) -> List:
+    def _build_context(self, analysis_data: Dict[str, Any], filename: str) -> ReportContext:
+        """Collect the values every report section needs in a single pass"""
+        risks = analysis_data.get('risks', [])
+        buckets = {'high': [], 'medium': [], 'low': []}
+        for risk in risks:
+            bucket = buckets.get(risk.get('severity'))
+            if bucket is not None:
+                bucket.append(risk)
+        
+        # Capture one timestamp so every section reports the same instant
+        now = datetime.now()
+        return ReportContext(
+            filename=filename,
+            analysis_id=analysis_data.get('analysis_id', 'N/A'),
+            risk_level=analysis_data.get('risk_level', 'UNKNOWN'),
+            risk_score=analysis_data.get('risk_score', 0),
+            risks=risks,
+            compliance=analysis_data.get('compliance', []),
+            buckets=buckets,
+            now_full=now.strftime("%B %d, %Y at %I:%M %p"),
+            now_date=now.strftime("%B %d, %Y"),
+            now_iso=now.strftime("%Y-%m-%d %H:%M:%S"),
+        )
+
+    def generate_pdf_reports_batch(self, items: List[Tuple[Dict[str, Any], str]]) -> List[BytesIO]:
+        """Generate several PDF reports in parallel, one process per CPU core"""
+        if len(items) < 2:
+            return [self.generate_pdf_report(analysis_data, filename) for analysis_data, filename in items]
+        
+        # ReportLab holds the GIL for the whole build, so fan out across processes
+        with ProcessPoolExecutor(initializer=init_report_worker) as executor:
+            return [BytesIO(pdf_bytes) for pdf_bytes in executor.map(_worker_generate, items)]
+
+    def generate_html_report(self, analysis_data: Dict[str, Any], filename: str) -> str:
+        """Generate the report as a lightweight HTML document with the same sections as the PDF (no layout pass)"""
+        ctx = self._build_context(analysis_data, filename)
+        high_risks = ctx.buckets['high']
+        medium_risks = ctx.buckets['medium']
+
+        parts = [
+            "<!DOCTYPE html><html><head><meta charset='utf-8'>",
+            f"<title>Contract Risk Analysis - {escape(filename)}</title></head><body>",
+            "<h1>Contract Risk Analysis &amp; Negotiation Report</h1>",
+            "<h2>Comprehensive Legal Analysis &amp; Strategic Recommendations</h2>",
+        ]
+
+        # Title page
+        doc_info = [
+            ("Document Analyzed:", filename),
+            ("Analysis Date:", ctx.now_full),
+            ("Analysis ID:", ctx.analysis_id),
+            ("Risk Level:", ctx.risk_level),
+            ("Risk Score:", f"{ctx.risk_score}/30"),
+            ("Total Risks Found:", len(ctx.risks)),
+            ("Compliance Issues:", len(ctx.compliance)),
+        ]
+        parts.append("<table>")
+        parts.extend(f"<tr><th>{label}</th><td>{escape(str(value))}</td></tr>" for label, value in doc_info)
+        parts.append("</table>")
+        parts.append(
+            f"<p><b>Overall Risk Assessment:</b> "
+            f"<span style='color:{self._get_risk_color(ctx.risk_level)}'>{escape(ctx.risk_level)}</span><br/>"
+            f"<i>{self._get_risk_description(ctx.risk_level)}</i></p>"
+        )
+        if not ctx.risks and not ctx.compliance:
+            parts.append("<p>✅ No issues found: no significant risks or compliance issues were detected in this contract.</p>")
+
+        # Table of contents
+        parts.append("<h2>Table of Contents</h2><ol>")
+        parts.extend(f"<li>{title}</li>" for title in self._section_titles(ctx))
+        parts.append("</ol>")
+
+        # Executive summary
+        parts.append("<h2>Executive Summary</h2>")
+        parts.append(
+            f"<p>This comprehensive contract analysis reveals a <b>{escape(ctx.risk_level.lower())}</b> risk profile "
+            f"with a risk score of <b>{ctx.risk_score}/30</b>. The analysis identified {len(ctx.risks)} risk factors "
+            f"and {len(ctx.compliance)} compliance considerations.</p>"
+        )
+        parts.append(f"<p>{escape(analysis_data.get('summary', 'No summary available.'))}</p>")
+        parts.append("<h3>Key Findings</h3><table><tr><th>Risk Category</th><th>Count</th><th>Priority</th><th>Action Required</th></tr>")
+        findings = [
+            ("High Risk Items", len(high_risks), "Critical", "Immediate Review"),
+            ("Medium Risk Items", len(medium_risks), "Moderate", "Negotiate"),
+            ("Low Risk Items", len(ctx.buckets['low']), "Minor", "Monitor"),
+            ("Compliance Issues", len(ctx.compliance), "Review", "Verify"),
+        ]
+        parts.extend(f"<tr><td>{label}</td><td>{count}</td><td>{priority}</td><td>{action}</td></tr>"
+                     for label, count, priority, action in findings)
+        parts.append("</table><h3>Top Recommendations</h3>")
+        if high_risks:
+            parts.append(f"<p>⚠️ <b>Critical:</b> Address {len(high_risks)} high-risk items before signing</p>")
+        if medium_risks:
+            parts.append(f"<p>⚖️ <b>Negotiate:</b> Review {len(medium_risks)} medium-risk terms</p>")
+        if ctx.risk_score < 10:
+            parts.append("<p>✅ <b>Positive:</b> Contract appears to have reasonable terms</p>")
+
+        # Contract overview
+        parts.append("<h2>Contract Overview</h2>")
+        parts.append(
+            f"<p><b>Document:</b> {escape(filename)}<br/>"
+            f"<b>Analysis Date:</b> {ctx.now_date}<br/>"
+            f"<b>Risk Profile:</b> {escape(ctx.risk_level)} ({ctx.risk_score}/30)<br/>"
+            f"<b>Analysis Scope:</b> Legal risk assessment, compliance review, and negotiation strategy</p>"
+        )
+        parts.append("<h3>Risk Distribution</h3>")
+        distribution = self._risk_distribution(ctx)
+        if distribution:
+            parts.append("<table><tr><th>Category</th><th>High</th><th>Medium</th><th>Low</th><th>Total</th></tr>")
+            parts.extend(f"<tr><td>{escape(category)}</td><td>{high}</td><td>{medium}</td><td>{low}</td><td>{total}</td></tr>"
+                         for category, high, medium, low, total in distribution)
+            parts.append("</table>")
+
+        # Detailed risk analysis (skipped when empty, as in the PDF)
+        if ctx.risks:
+            parts.append("<h2>Detailed Risk Analysis</h2>")
+            for risk in ctx.risks:
+                category = risk.get('category', 'Other')
+                severity = risk.get('severity', 'low')
+                parts.append(
+                    f"<div><h3>{escape(category)} "
+                    f"(<span style='color:{self._get_severity_color(severity)}'>{escape(severity.upper())}</span>)</h3>"
+                    f"<p><b>Issue:</b> {escape(risk.get('description', 'No description'))}<br/>"
+                    f"<b>Location:</b> {escape(risk.get('clause', 'Not specified'))}<br/>"
+                    f"<b>Current Recommendation:</b> {escape(risk.get('recommendation', 'Review required'))}</p>"
+                )
+                guidance = self.negotiation_guidance.get(category)
+                if guidance:
+                    parts.append("<ul>")
+                    parts.extend(f"<li>{point}</li>" for point in guidance['negotiation_points'][:3])
+                    parts.append(f"</ul><p><b>Market Standard:</b> {guidance['market_standard']}</p>")
+                parts.append("</div>")
+
+        # Compliance analysis (skipped when empty, as in the PDF)
+        if ctx.compliance:
+            parts.append("<h2>Compliance Analysis</h2>")
+            for comp in ctx.compliance:
+                status = comp.get('status', 'check')
+                parts.append(
+                    f"<p><b>{escape(comp.get('regulation', 'Other'))}:</b> "
+                    f"{STATUS_ICON.get(status, STATUS_ICON_DEFAULT)} {escape(comp.get('description', 'Compliance issue'))}<br/>"
+                    f"<b>Status:</b> {escape(status.upper())}<br/>"
+                    f"<b>Location:</b> {escape(comp.get('clause', 'Not specified'))}<br/>"
+                    f"<b>Action:</b> {escape(comp.get('recommendation', 'Review with legal counsel'))}</p>"
+                )
+
+        # Negotiation strategy
+        parts.append("<h2>Negotiation Strategy</h2>")
+        heading, text = NEGOTIATION_STRATEGIES.get(ctx.risk_level, NEGOTIATION_STRATEGY_DEFAULT)
+        parts.append(f"<p><b>{heading}</b><br/>{text}</p>")
+        for title, bucket in (("🔥 High Priority Negotiation Items", high_risks),
+                              ("⚖️ Medium Priority Negotiation Items", medium_risks)):
+            if bucket:
+                parts.append(f"<h3>{title}</h3><ol>")
+                parts.extend(
+                    f"<li><b>{escape(risk.get('category', 'Risk'))}:</b> {escape(risk.get('recommendation', 'Review required'))}</li>"
+                    for risk in bucket
+                )
+                parts.append("</ol>")
+
+        # Recommendations
+        parts.append("<h2>Strategic Recommendations</h2>")
+        heading, text = OVERALL_RECOMMENDATIONS.get(ctx.risk_level, OVERALL_RECOMMENDATION_DEFAULT)
+        parts.append(f"<p><b>{heading}</b><br/>{text}</p>")
+        parts.append("<h3>Specific Actions</h3><ol>")
+        parts.extend(f"<li>{action}</li>" for action in SPECIFIC_ACTIONS)
+        parts.append("</ol><h3>Next Steps</h3><ol>")
+        parts.extend(f"<li>{step}</li>" for step in NEXT_STEPS.get(ctx.risk_level, NEXT_STEPS_DEFAULT))
+        parts.append("</ol>")
+
+        # Technical details
+        parts.append("<h2>Technical Details</h2><table>")
+        tech_data = [
+            ("Analysis ID", ctx.analysis_id),
+            ("Analysis Date", ctx.now_iso),
+            ("Risk Algorithm Version", "2.0 (Enhanced)"),
+            ("AI Model Used", "Hugging Face GPT-2 + Pattern Matching"),
+            ("Confidence Level", "High"),
+            ("Analysis Scope", "Legal Risk + Compliance + Negotiation Strategy"),
+        ]
+        parts.extend(f"<tr><th>{label}</th><td>{escape(str(value))}</td></tr>" for label, value in tech_data)
+        parts.append(f"</table><p><b>Disclaimer:</b> {DISCLAIMER}</p>")
+        parts.append("</body></html>")
+
+        return "".join(parts)
+
+    def _create_title_page(self, ctx: ReportContext) -> List:
         """Create the title page"""
         story = []
         
@@ -285,31 +671,23 @@ class EnhancedContractReportGenerator:
         
         # Document info
         doc_info = [
-            ["Document Analyzed:", filename],
-            ["Analysis Date:", datetime.now().strftime("%B %d, %Y at %I:%M %p")],
-            ["Analysis ID:", analysis_data.get('analysis_id', 'N/A')],
-            ["Risk Level:", f"<b>{analysis_data.get('risk_level', 'UNKNOWN')}</b>"],
-            ["Risk Score:", f"<b>{analysis_data.get('risk_score', 0)}/30</b>"],
-            ["Total Risks Found:", f"<b>{len(analysis_data.get('risks', []))}</b>"],
-            ["Compliance Issues:", f"<b>{len(analysis_data.get('compliance', []))}</b>"]
+            ["Document Analyzed:", ctx.filename],
+            ["Analysis Date:", ctx.now_full],
+            ["Analysis ID:", ctx.analysis_id],
+            ["Risk Level:", f"<b>{ctx.risk_level}</b>"],
+            ["Risk Score:", f"<b>{ctx.risk_score}/30</b>"],
+            ["Total Risks Found:", f"<b>{len(ctx.risks)}</b>"],
+            ["Compliance Issues:", f"<b>{len(ctx.compliance)}</b>"]
         ]
         
         doc_table = Table(doc_info, colWidths=[2.5*inch, 4*inch])
-        doc_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-        ]))
+        doc_table.setStyle(self._title_table_style)
         
         story.append(doc_table)
         story.append(Spacer(1, 30))
         
         # Risk level indicator with color
-        risk_level = analysis_data.get('risk_level', 'UNKNOWN')
+        risk_level = ctx.risk_level
         risk_color = self._get_risk_color(risk_level)
         risk_description = self._get_risk_description(risk_level)
         
@@ -320,33 +698,39 @@ class EnhancedContractReportGenerator:
         )
         story.append(risk_indicator)
         
+        if not ctx.risks and not ctx.compliance:
+            story.append(Spacer(1, 15))
+            story.append(Paragraph(
+                "✅ No issues found: no significant risks or compliance issues were detected in this contract.",
+                self.styles['Success']
+            ))
+        
         return story
 
-    def _create_table_of_contents(self) -> List:
+    def _create_table_of_contents(self, ctx: ReportContext) -> List:
         """Create table of contents"""
         story = []
         
         story.append(Paragraph("Table of Contents", self.styles['SectionHeader']))
         story.append(Spacer(1, 20))
         
-        toc_items = [
-            "Executive Summary",
-            "Contract Overview",
-            "Detailed Risk Analysis",
-            "Compliance Analysis", 
-            "Negotiation Strategy",
-            "Recommendations",
-            "Technical Details"
-        ]
-        
-        for i, item in enumerate(toc_items, 1):
-            toc_item = Paragraph(f"{i}. {item}", self.styles['Summary'])
-            story.append(toc_item)
-            story.append(Spacer(1, 5))
+        toc_html = "<br/>".join(f"{i}. {item}" for i, item in enumerate(self._section_titles(ctx), 1))
+        story.append(Paragraph(toc_html, self.styles['Summary']))
+        story.append(Spacer(1, 5))
         
         return story
 
-    def _create_executive_summary(self, analysis_data: Dict[str, Any]) -> List:
+    def _section_titles(self, ctx: ReportContext) -> List[str]:
+        """List the report sections in order, leaving out empty risk/compliance sections"""
+        titles = ["Executive Summary", "Contract Overview"]
+        if ctx.risks:
+            titles.append("Detailed Risk Analysis")
+        if ctx.compliance:
+            titles.append("Compliance Analysis")
+        titles.extend(["Negotiation Strategy", "Recommendations", "Technical Details"])
+        return titles
+
+    def _create_executive_summary(self, ctx: ReportContext) -> List:
         """Create comprehensive executive summary"""
         story = []
         
@@ -354,12 +738,12 @@ class EnhancedContractReportGenerator:
         story.append(Spacer(1, 15))
         
         # Overall assessment
-        risk_level = analysis_data.get('risk_level', 'UNKNOWN')
-        risk_score = analysis_data.get('risk_score', 0)
+        risk_level = ctx.risk_level
+        risk_score = ctx.risk_score
         
         summary_text = f"""
         This comprehensive contract analysis reveals a <b>{risk_level.lower()}</b> risk profile with a risk score of <b>{risk_score}/30</b>. 
-        The analysis identified {len(analysis_data.get('risks', []))} risk factors and {len(analysis_data.get('compliance', []))} compliance considerations.
+        The analysis identified {len(ctx.risks)} risk factors and {len(ctx.compliance)} compliance considerations.
         """
         
         story.append(Paragraph(summary_text, self.styles['Summary']))
@@ -368,32 +752,20 @@ class EnhancedContractReportGenerator:
         # Key findings
         story.append(Paragraph("Key Findings", self.styles['SubsectionHeader']))
         
-        risks = analysis_data.get('risks', [])
-        high_risks = [r for r in risks if r.get('severity') == 'high']
-        medium_risks = [r for r in risks if r.get('severity') == 'medium']
-        low_risks = [r for r in risks if r.get('severity') == 'low']
+        high_risks = ctx.buckets['high']
+        medium_risks = ctx.buckets['medium']
+        low_risks = ctx.buckets['low']
         
         findings_data = [
             ["Risk Category", "Count", "Priority", "Action Required"],
             ["High Risk Items", str(len(high_risks)), "Critical", "Immediate Review"],
             ["Medium Risk Items", str(len(medium_risks)), "Moderate", "Negotiate"],
             ["Low Risk Items", str(len(low_risks)), "Minor", "Monitor"],
-            ["Compliance Issues", str(len(analysis_data.get('compliance', []))), "Review", "Verify"]
+            ["Compliance Issues", str(len(ctx.compliance)), "Review", "Verify"]
         ]
         
         findings_table = Table(findings_data, colWidths=[2*inch, 0.8*inch, 1.2*inch, 2*inch])
-        findings_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('BACKGROUND', (0, 1), (-1, 1), colors.lightcoral),
-            ('BACKGROUND', (0, 2), (-1, 2), colors.lightyellow),
-            ('BACKGROUND', (0, 3), (-1, 3), colors.lightgreen),
-        ]))
+        findings_table.setStyle(self._findings_table_style)
         
         story.append(findings_table)
         story.append(Spacer(1, 15))
@@ -421,7 +793,7 @@ class EnhancedContractReportGenerator:
         
         return story
 
-    def _create_contract_overview(self, analysis_data: Dict[str, Any], filename: str) -> List:
+    def _create_contract_overview(self, ctx: ReportContext) -> List:
         """Create contract overview section"""
         story = []
         
@@ -430,9 +802,9 @@ class EnhancedContractReportGenerator:
         
         # Contract details
         overview_text = f"""
-        <b>Document:</b> {filename}<br/>
-        <b>Analysis Date:</b> {datetime.now().strftime("%B %d, %Y")}<br/>
-        <b>Risk Profile:</b> {analysis_data.get('risk_level', 'UNKNOWN')} ({analysis_data.get('risk_score', 0)}/30)<br/>
+        <b>Document:</b> {ctx.filename}<br/>
+        <b>Analysis Date:</b> {ctx.now_date}<br/>
+        <b>Risk Profile:</b> {ctx.risk_level} ({ctx.risk_score}/30)<br/>
         <b>Analysis Scope:</b> Legal risk assessment, compliance review, and negotiation strategy
         """
         
@@ -442,58 +814,40 @@ class EnhancedContractReportGenerator:
         # Risk distribution
         story.append(Paragraph("Risk Distribution", self.styles['SubsectionHeader']))
         
-        risks = analysis_data.get('risks', [])
-        risk_categories = {}
-        for risk in risks:
-            category = risk.get('category', 'Other')
-            if category not in risk_categories:
-                risk_categories[category] = {'high': 0, 'medium': 0, 'low': 0}
-            severity = risk.get('severity', 'low')
-            risk_categories[category][severity] += 1
-        
-        if risk_categories:
-            cat_data = [["Category", "High", "Medium", "Low", "Total"]]
-            for category, counts in risk_categories.items():
-                total = sum(counts.values())
-                cat_data.append([
-                    category,
-                    str(counts['high']),
-                    str(counts['medium']),
-                    str(counts['low']),
-                    str(total)
-                ])
+        distribution = self._risk_distribution(ctx)
+        
+        if distribution:
+            cat_data = [["Category", "High", "Medium", "Low", "Total"], *distribution]
             
             cat_table = Table(cat_data, colWidths=[2.5*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch])
-            cat_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ]))
+            cat_table.setStyle(self._category_table_style)
             
             story.append(cat_table)
         
         return story
 
-    def _create_detailed_risk_analysis(self, analysis_data: Dict[str, Any]) -> List:
+    def _risk_distribution(self, ctx: ReportContext) -> List[List[str]]:
+        """Count risks per category and severity as [category, high, medium, low, total] rows"""
+        severity_counts = Counter((r.get('category', 'Other'), r.get('severity', 'low')) for r in ctx.risks)
+        rows = []
+        # Categories keep first-seen order
+        for category in dict.fromkeys(category for category, _ in severity_counts):
+            high = severity_counts[(category, 'high')]
+            medium = severity_counts[(category, 'medium')]
+            low = severity_counts[(category, 'low')]
+            rows.append([category, str(high), str(medium), str(low), str(high + medium + low)])
+        return rows
+
+    def _create_detailed_risk_analysis(self, ctx: ReportContext) -> List:
         """Create detailed risk analysis with explanations and negotiation points"""
         story = []
         
         story.append(Paragraph("Detailed Risk Analysis", self.styles['SectionHeader']))
         story.append(Spacer(1, 15))
         
-        risks = analysis_data.get('risks', [])
-        
-        if not risks:
-            story.append(Paragraph("✅ No significant risks detected in this contract.", self.styles['Success']))
-            return story
-        
         # Group risks by category
         risk_categories = {}
-        for risk in risks:
+        for risk in ctx.risks:
             category = risk.get('category', 'Other')
             if category not in risk_categories:
                 risk_categories[category] = []
@@ -512,7 +866,6 @@ class EnhancedContractReportGenerator:
             # Individual risks
             for i, risk in enumerate(category_risks, 1):
                 severity = risk.get('severity', 'low')
-                severity_color = self._get_severity_color(severity)
                 
                 risk_text = f"""
                 <b>{i}. {risk.get('category', 'Risk')} ({severity.upper()})</b><br/>
@@ -553,22 +906,16 @@ class EnhancedContractReportGenerator:
         
         return story
 
-    def _create_compliance_analysis(self, analysis_data: Dict[str, Any]) -> List:
+    def _create_compliance_analysis(self, ctx: ReportContext) -> List:
         """Create compliance analysis section"""
         story = []
         
         story.append(Paragraph("Compliance Analysis", self.styles['SectionHeader']))
         story.append(Spacer(1, 15))
         
-        compliance = analysis_data.get('compliance', [])
-        
-        if not compliance:
-            story.append(Paragraph("✅ No specific compliance issues identified.", self.styles['Success']))
-            return story
-        
         # Group by regulation
         compliance_by_reg = {}
-        for comp in compliance:
+        for comp in ctx.compliance:
             regulation = comp.get('regulation', 'Other')
             if regulation not in compliance_by_reg:
                 compliance_by_reg[regulation] = []
@@ -579,7 +926,7 @@ class EnhancedContractReportGenerator:
             
             for i, comp in enumerate(reg_compliance, 1):
                 status = comp.get('status', 'check')
-                status_icon = "⚠️" if status == "warning" else "❌" if status == "critical" else "✅"
+                status_icon = STATUS_ICON.get(status, STATUS_ICON_DEFAULT)
                 
                 comp_text = f"""
                 <b>{i}. {status_icon} {comp.get('description', 'Compliance issue')}</b><br/>
@@ -593,144 +940,72 @@ class EnhancedContractReportGenerator:
         
         return story
 
-    def _create_negotiation_strategy(self, analysis_data: Dict[str, Any]) -> List:
+    def _create_negotiation_strategy(self, ctx: ReportContext) -> List:
         """Create negotiation strategy section"""
         story = []
         
         story.append(Paragraph("Negotiation Strategy", self.styles['SectionHeader']))
         story.append(Spacer(1, 15))
         
-        risks = analysis_data.get('risks', [])
-        risk_level = analysis_data.get('risk_level', 'UNKNOWN')
-        
         # Overall strategy
-        if risk_level in ['CRITICAL', 'HIGH']:
-            strategy_text = """
-            <b>🚨 High-Risk Contract - Aggressive Negotiation Required</b><br/>
-            This contract contains significant risks that require immediate attention. 
-            Consider requesting substantial modifications or walking away if terms cannot be improved.
-            """
-        elif risk_level == 'MEDIUM':
-            strategy_text = """
-            <b>⚖️ Medium-Risk Contract - Balanced Negotiation Approach</b><br/>
-            This contract has some concerning terms but is generally negotiable. 
-            Focus on the highest-risk items while accepting reasonable terms on others.
-            """
-        else:
-            strategy_text = """
-            <b>✅ Low-Risk Contract - Standard Negotiation</b><br/>
-            This contract appears to have reasonable terms. Focus on minor improvements 
-            and ensuring all terms are clearly understood.
-            """
-        
-        story.append(Paragraph(strategy_text, self.styles['Summary']))
+        heading, text = NEGOTIATION_STRATEGIES.get(ctx.risk_level, NEGOTIATION_STRATEGY_DEFAULT)
+        story.append(Paragraph(f"<b>{heading}</b><br/>{text}", self.styles['Summary']))
         story.append(Spacer(1, 15))
         
         # Priority negotiation items
-        high_risks = [r for r in risks if r.get('severity') == 'high']
-        medium_risks = [r for r in risks if r.get('severity') == 'medium']
+        high_risks = ctx.buckets['high']
+        medium_risks = ctx.buckets['medium']
         
         if high_risks:
             story.append(Paragraph("🔥 High Priority Negotiation Items", self.styles['SubsectionHeader']))
-            for i, risk in enumerate(high_risks, 1):
-                story.append(Paragraph(
-                    f"{i}. <b>{risk.get('category', 'Risk')}:</b> {risk.get('recommendation', 'Review required')}",
-                    self.styles['Warning']
-                ))
+            high_html = "<br/>".join(
+                f"{i}. <b>{risk.get('category', 'Risk')}:</b> {risk.get('recommendation', 'Review required')}"
+                for i, risk in enumerate(high_risks, 1)
+            )
+            story.append(Paragraph(high_html, self.styles['Warning']))
             story.append(Spacer(1, 10))
         
         if medium_risks:
             story.append(Paragraph("⚖️ Medium Priority Negotiation Items", self.styles['SubsectionHeader']))
-            for i, risk in enumerate(medium_risks, 1):
-                story.append(Paragraph(
-                    f"{i}. <b>{risk.get('category', 'Risk')}:</b> {risk.get('recommendation', 'Review required')}",
-                    self.styles['Summary']
-                ))
+            medium_html = "<br/>".join(
+                f"{i}. <b>{risk.get('category', 'Risk')}:</b> {risk.get('recommendation', 'Review required')}"
+                for i, risk in enumerate(medium_risks, 1)
+            )
+            story.append(Paragraph(medium_html, self.styles['Summary']))
         
         return story
 
-    def _create_recommendations(self, analysis_data: Dict[str, Any]) -> List:
+    def _create_recommendations(self, ctx: ReportContext) -> List:
         """Create comprehensive recommendations section"""
         story = []
         
         story.append(Paragraph("Strategic Recommendations", self.styles['SectionHeader']))
         story.append(Spacer(1, 15))
         
-        risk_level = analysis_data.get('risk_level', 'UNKNOWN')
-        risk_score = analysis_data.get('risk_score', 0)
-        
         # Overall recommendation
-        if risk_level in ['CRITICAL', 'HIGH']:
-            overall_rec = """
-            <b>🚨 IMMEDIATE ACTION REQUIRED</b><br/>
-            This contract presents significant legal and financial risks. 
-            We strongly recommend extensive negotiations or reconsideration of the agreement.
-            """
-        elif risk_level == 'MEDIUM':
-            overall_rec = """
-            <b>⚖️ NEGOTIATION RECOMMENDED</b><br/>
-            This contract has some concerning terms that should be addressed 
-            before signing. Focus on the highest-risk items.
-            """
-        else:
-            overall_rec = """
-            <b>✅ GENERALLY ACCEPTABLE</b><br/>
-            This contract appears to have reasonable terms. 
-            Minor negotiations may be beneficial but are not critical.
-            """
-        
-        story.append(Paragraph(overall_rec, self.styles['Summary']))
+        heading, text = OVERALL_RECOMMENDATIONS.get(ctx.risk_level, OVERALL_RECOMMENDATION_DEFAULT)
+        story.append(Paragraph(f"<b>{heading}</b><br/>{text}", self.styles['Summary']))
         story.append(Spacer(1, 15))
         
         # Specific recommendations
         story.append(Paragraph("Specific Actions", self.styles['SubsectionHeader']))
         
-        recommendations = [
-            "Review all high-risk items with legal counsel",
-            "Negotiate liability caps and indemnification terms",
-            "Ensure payment terms are reasonable and achievable",
-            "Verify compliance with applicable regulations",
-            "Request clarification on ambiguous terms",
-            "Consider insurance requirements for high-risk contracts",
-            "Document all negotiations and changes"
-        ]
-        
-        for i, rec in enumerate(recommendations, 1):
-            story.append(Paragraph(f"{i}. {rec}", self.styles['RiskItem']))
+        rec_html = "<br/>".join(f"{i}. {rec}" for i, rec in enumerate(SPECIFIC_ACTIONS, 1))
+        story.append(Paragraph(rec_html, self.styles['RiskItem']))
         
         story.append(Spacer(1, 15))
         
         # Next steps
         story.append(Paragraph("Next Steps", self.styles['SubsectionHeader']))
         
-        if risk_level in ['CRITICAL', 'HIGH']:
-            next_steps = [
-                "Schedule immediate legal review",
-                "Prepare negotiation strategy",
-                "Identify deal-breaker terms",
-                "Consider alternative suppliers/vendors"
-            ]
-        elif risk_level == 'MEDIUM':
-            next_steps = [
-                "Prioritize high-risk items for negotiation",
-                "Prepare counter-proposals",
-                "Set negotiation timeline",
-                "Identify acceptable compromises"
-            ]
-        else:
-            next_steps = [
-                "Review terms with stakeholders",
-                "Prepare minor negotiation requests",
-                "Set signing timeline",
-                "Plan implementation"
-            ]
-        
-        for i, step in enumerate(next_steps, 1):
-            story.append(Paragraph(f"{i}. {step}", self.styles['RiskItem']))
+        next_steps = NEXT_STEPS.get(ctx.risk_level, NEXT_STEPS_DEFAULT)
+        
+        steps_html = "<br/>".join(f"{i}. {step}" for i, step in enumerate(next_steps, 1))
+        story.append(Paragraph(steps_html, self.styles['RiskItem']))
         
         return story
 
-    def _create_technical_details(self, analysis_data: Dict[str, Any]) -> List:
+    def _create_technical_details(self, ctx: ReportContext) -> List:
         """Create technical details section"""
         story = []
         
@@ -739,8 +1014,8 @@ class EnhancedContractReportGenerator:
         
         # Analysis metadata
         tech_data = [
-            ["Analysis ID", analysis_data.get('analysis_id', 'N/A')],
-            ["Analysis Date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
+            ["Analysis ID", ctx.analysis_id],
+            ["Analysis Date", ctx.now_iso],
             ["Risk Algorithm Version", "2.0 (Enhanced)"],
             ["AI Model Used", "Hugging Face GPT-2 + Pattern Matching"],
             ["Confidence Level", "High"],
@@ -748,57 +1023,24 @@ class EnhancedContractReportGenerator:
         ]
         
         tech_table = Table(tech_data, colWidths=[2.5*inch, 4*inch])
-        tech_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-        ]))
+        tech_table.setStyle(self._tech_table_style)
         
         story.append(tech_table)
         story.append(Spacer(1, 20))
         
         # Disclaimer
-        disclaimer = """
-        <b>Disclaimer:</b> This analysis is provided for informational purposes only and does not constitute legal advice. 
-        Always consult with qualified legal counsel before making decisions based on this analysis. 
-        The analysis is based on automated review and may not capture all nuances of complex legal documents.
-        """
-        
-        story.append(Paragraph(disclaimer, self.styles['Summary']))
+        story.append(Paragraph(f"<b>Disclaimer:</b> {DISCLAIMER}", self.styles['Summary']))
         
         return story
 
     def _get_risk_color(self, risk_level: str) -> str:
         """Get color for risk level"""
-        colors_map = {
-            'CRITICAL': 'red',
-            'HIGH': 'orange',
-            'MEDIUM': 'yellow',
-            'LOW': 'green',
-            'MINIMAL': 'blue'
-        }
-        return colors_map.get(risk_level.upper(), 'black')
+        return RISK_COLORS.get(risk_level.upper(), 'black')
 
     def _get_severity_color(self, severity: str) -> str:
         """Get color for severity level"""
-        colors_map = {
-            'high': 'red',
-            'medium': 'orange',
-            'low': 'green'
-        }
-        return colors_map.get(severity.lower(), 'black')
+        return SEVERITY_COLORS.get(severity.lower(), 'black')
 
     def _get_risk_description(self, risk_level: str) -> str:
         """Get description for risk level"""
-        descriptions = {
-            'CRITICAL': 'Immediate legal review required. Significant risks present.',
-            'HIGH': 'Extensive negotiations recommended. Multiple concerning terms.',
-            'MEDIUM': 'Some negotiation needed. Standard contract with risks.',
-            'LOW': 'Generally acceptable terms. Minor improvements possible.',
-            'MINIMAL': 'Very low risk. Standard contract terms.'
-        }
-        return descriptions.get(risk_level.upper(), 'Risk level unclear.') 
\ No newline at end of file
+        return RISK_DESCRIPTIONS.get(risk_level.upper(), 'Risk level unclear.') 
\ No newline at end of file
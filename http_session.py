@@ -0,0 +1,22 @@
+"""
+Pooled requests sessions shared by the Hugging Face test scripts
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+def pooled_session(retry_statuses: tuple = (502, 503, 504), total: int = 3, backoff_factor: float = 0.5,
+                   pool_connections: int = 8, pool_maxsize: int = 16) -> requests.Session:
+    """Create a session whose connections are kept alive and reused across calls"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        # Only the listed statuses and failed connects are retried; a read timeout already used the
+        # full 30 s, so it is reported instead of being repeated
+        max_retries=Retry(total=total, connect=2, read=0, backoff_factor=backoff_factor,
+                          status_forcelist=retry_statuses, allowed_methods=frozenset({"POST"}),
+                          raise_on_status=False)
+    ))
+    return session
@@ -1,20 +1,36 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, HTMLResponse, ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
-import uvicorn
-import json
-import re
+from typing import List, Dict, Any, Tuple, Iterator
+from io import BytesIO
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import multiprocessing
+import hashlib
+import os
+import secrets
+import time
 from datetime import datetime
-import uuid
 from enhanced_analysis import EnhancedContractAnalyzer
-from enhanced_report_generator import EnhancedContractReportGenerator
+from enhanced_report_generator import EnhancedContractReportGenerator, init_report_worker, render_pdf_report
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the shared analyzer before serving traffic
+    await analyzer.warmup()
+    yield
+    pdf_pool.shutdown(wait=False, cancel_futures=True)
 
 app = FastAPI(
     title="AI Contract Risk Analyzer",
     description="AI-powered contract analysis and risk assessment service",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -53,26 +69,147 @@ class AnalysisResponse(BaseModel):
     summary: str
     timestamp: str
 
-# Initialize enhanced analyzer
+# Initialize enhanced analyzer (shared by all requests)
 analyzer = EnhancedContractAnalyzer()
 report_generator = EnhancedContractReportGenerator()
 
-async def analyze_contract_content(content: str) -> Dict[str, Any]:
-    """Enhanced AI-powered contract analysis with Hugging Face integration"""
+# uvicorn's --workers also defaults to WEB_CONCURRENCY; each server worker gets an equal share
+# of the cores for PDF rendering so the total stays near cpu_count rather than cpu_count ** 2
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)))
+
+def new_pdf_pool() -> ProcessPoolExecutor:
+    """Create the PDF worker pool"""
+    # Workers start lazily inside the threaded server process, so they come from a
+    # forkserver rather than fork() to avoid inheriting locks held by other threads
+    return ProcessPoolExecutor(
+        max_workers=PDF_WORKERS,
+        mp_context=multiprocessing.get_context("forkserver"),
+        initializer=init_report_worker
+    )
+
+# ReportLab holds the GIL while rendering, so PDFs are built in worker processes
+pdf_pool = new_pdf_pool()
+
+async def build_pdf(analysis_result: Dict[str, Any], filename: str) -> BytesIO:
+    """Render a PDF report in the process pool"""
+    global pdf_pool
+    loop = asyncio.get_running_loop()
+    pool = pdf_pool
+    try:
+        pdf_bytes = await loop.run_in_executor(pool, render_pdf_report, analysis_result, filename)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed) and the pool refuses all further work; replace it
+        # (once, even if several requests notice together) and retry this report on the new pool
+        if pdf_pool is pool:
+            pdf_pool = new_pdf_pool()
+            pool.shutdown(wait=False, cancel_futures=True)
+        pdf_bytes = await loop.run_in_executor(pdf_pool, render_pdf_report, analysis_result, filename)
+    return BytesIO(pdf_bytes)
+
+# Analysis results keyed by SHA-256 of the contract text (LRU with a TTL)
+ANALYSIS_CACHE_SIZE = 256
+ANALYSIS_CACHE_TTL = 24 * 60 * 60
+analysis_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+inflight_analyses: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+
+# Oversized uploads are refused from the Content-Length header before the multipart body is received
+MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_PATHS = frozenset({"/analyze-file", "/analyze-file-report"})
+# Allowance for the multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+UPLOAD_TOO_LARGE = f"File exceeds {MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit"
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """Answer 413 from the headers alone so an oversized body is never parsed or spooled"""
+    if request.url.path in UPLOAD_PATHS:
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES:
+            return ORJSONResponse(status_code=413, content={"detail": UPLOAD_TOO_LARGE})
+    return await call_next(request)
+
+async def read_upload(file: UploadFile) -> bytearray:
+    """Read an uploaded file in chunks, enforcing MAX_UPLOAD_BYTES"""
+    # Starlette records the spooled size; the chunked cap below covers bodies sent without a length
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=UPLOAD_TOO_LARGE)
+    
+    content = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        content += chunk
+        if len(content) > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail=UPLOAD_TOO_LARGE)
+    return content
+
+# PDFs are sent in fixed-size chunks rather than line by line
+PDF_CHUNK_SIZE = 64 * 1024
+
+def iter_pdf(pdf_buffer: BytesIO) -> Iterator[bytes]:
+    """Yield a generated PDF in PDF_CHUNK_SIZE pieces"""
+    while chunk := pdf_buffer.read(PDF_CHUNK_SIZE):
+        yield chunk
+
+def pdf_response(pdf_buffer: BytesIO, analysis_id: str) -> StreamingResponse:
+    """Stream a generated PDF report back to the client as an attachment"""
+    return StreamingResponse(
+        iter_pdf(pdf_buffer),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename=contract_analysis_{analysis_id[:8]}.pdf",
+            "Content-Length": str(pdf_buffer.getbuffer().nbytes - pdf_buffer.tell())
+        }
+    )
+
+async def _run_analysis(content: str, cache_key: str) -> Dict[str, Any]:
+    """Run the full analysis pipeline and cache the result if the LLM produced it"""
     
     # Use enhanced analyzer with AI
-    risks, risk_score = await analyzer.analyze_risks_with_ai(content)
-    compliance = analyzer.analyze_compliance(content)
+    risks, risk_score, used_ai = await analyzer.analyze_risks_with_ai(content)
+    # Pattern scanning is CPU-bound; keep it off the event loop
+    loop = asyncio.get_running_loop()
+    compliance = await loop.run_in_executor(None, analyzer.analyze_compliance, content)
     risk_level = analyzer.calculate_risk_level(risk_score)
     summary = analyzer.generate_summary(risks, compliance, risk_score)
     
-    return {
+    result = {
         "risk_level": risk_level,
         "risk_score": risk_score,
         "risks": risks,
         "compliance": compliance,
         "summary": summary
     }
+    
+    # A pattern-only fallback (OpenRouter failed) is not cached, so the next request tries the LLM again
+    if used_ai:
+        analysis_cache[cache_key] = (time.monotonic(), result)
+        analysis_cache.move_to_end(cache_key)
+        if len(analysis_cache) > ANALYSIS_CACHE_SIZE:
+            analysis_cache.popitem(last=False)
+    
+    return result
+
+async def analyze_contract_content(content: str) -> Dict[str, Any]:
+    """Enhanced AI-powered contract analysis with Hugging Face integration"""
+    
+    # Identical contracts skip the analysis entirely
+    cache_key = hashlib.sha256(content.encode()).hexdigest()
+    cached = analysis_cache.get(cache_key)
+    if cached and time.monotonic() - cached[0] < ANALYSIS_CACHE_TTL:
+        analysis_cache.move_to_end(cache_key)
+        # Callers add per-request metadata, so hand out a copy
+        return dict(cached[1])
+    
+    # Concurrent requests for the same contract share one in-flight analysis (and LLM call)
+    task = inflight_analyses.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_run_analysis(content, cache_key))
+        inflight_analyses[cache_key] = task
+        task.add_done_callback(lambda _: inflight_analyses.pop(cache_key, None))
+    
+    # Shield so one client disconnecting doesn't cancel the analysis for the others
+    return dict(await asyncio.shield(task))
 
 @app.get("/")
 async def root():
@@ -91,7 +228,7 @@ async def analyze_contract(request: AnalysisRequest):
         analysis_result = await analyze_contract_content(request.content)
         
         # Generate unique analysis ID
-        analysis_id = str(uuid.uuid4())
+        analysis_id = secrets.token_hex(8)
         
         return AnalysisResponse(
             analysis_id=analysis_id,
@@ -116,22 +253,25 @@ async def analyze_file(file: UploadFile = File(...)):
     
     # Read file content
     try:
-        content = await file.read()
+        content = await read_upload(file)
         
         # Use enhanced text extraction based on file type
-        content_str = analyzer.extract_text_from_file(content, file.content_type)
+        loop = asyncio.get_running_loop()
+        content_str = await loop.run_in_executor(None, analyzer.extract_text_from_file, content, file.content_type)
         
         if content_str.startswith("Error"):
             raise HTTPException(status_code=400, detail=content_str)
             
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to read file: {str(e)}")
     
-            # Perform enhanced analysis
-        analysis_result = await analyze_contract_content(content_str)
+    # Perform enhanced analysis
+    analysis_result = await analyze_contract_content(content_str)
     
     # Generate unique analysis ID
-    analysis_id = str(uuid.uuid4())
+    analysis_id = secrets.token_hex(8)
     
     return {
         "analysis_id": analysis_id,
@@ -153,19 +293,34 @@ async def generate_report(request: AnalysisRequest):
         analysis_result = await analyze_contract_content(request.content)
         
         # Add metadata
-        analysis_result["analysis_id"] = str(uuid.uuid4())
+        analysis_result["analysis_id"] = secrets.token_hex(8)
         analysis_result["filename"] = request.filename
         analysis_result["timestamp"] = datetime.now().isoformat()
         
         # Generate PDF report
-        pdf_buffer = report_generator.generate_pdf_report(analysis_result, request.filename)
+        pdf_buffer = await build_pdf(analysis_result, request.filename)
         
         # Return PDF as streaming response
-        return StreamingResponse(
-            pdf_buffer,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename=contract_analysis_{analysis_result['analysis_id'][:8]}.pdf"}
-        )
+        return pdf_response(pdf_buffer, analysis_result['analysis_id'])
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate report: {str(e)}")
+
+@app.post("/generate-html-report", response_class=HTMLResponse)
+async def generate_html_report(request: AnalysisRequest):
+    """Generate HTML report for contract analysis (faster than the PDF report)"""
+    
+    try:
+        # Perform analysis
+        analysis_result = await analyze_contract_content(request.content)
+        
+        # Add metadata
+        analysis_result["analysis_id"] = secrets.token_hex(8)
+        analysis_result["filename"] = request.filename
+        analysis_result["timestamp"] = datetime.now().isoformat()
+        
+        # Generate HTML report
+        return report_generator.generate_html_report(analysis_result, request.filename)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate report: {str(e)}")
@@ -179,8 +334,9 @@ async def analyze_file_and_generate_report(file: UploadFile = File(...)):
     
     try:
         # Read and parse file
-        content = await file.read()
-        content_str = analyzer.extract_text_from_file(content, file.content_type)
+        content = await read_upload(file)
+        loop = asyncio.get_running_loop()
+        content_str = await loop.run_in_executor(None, analyzer.extract_text_from_file, content, file.content_type)
         
         if content_str.startswith("Error"):
             raise HTTPException(status_code=400, detail=content_str)
@@ -189,22 +345,34 @@ async def analyze_file_and_generate_report(file: UploadFile = File(...)):
         analysis_result = await analyze_contract_content(content_str)
         
         # Add metadata
-        analysis_result["analysis_id"] = str(uuid.uuid4())
+        analysis_result["analysis_id"] = secrets.token_hex(8)
         analysis_result["filename"] = file.filename
         analysis_result["timestamp"] = datetime.now().isoformat()
         
         # Generate PDF report
-        pdf_buffer = report_generator.generate_pdf_report(analysis_result, file.filename)
+        pdf_buffer = await build_pdf(analysis_result, file.filename)
         
         # Return PDF as streaming response
-        return StreamingResponse(
-            pdf_buffer,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename=contract_analysis_{analysis_result['analysis_id'][:8]}.pdf"}
-        )
+        return pdf_response(pdf_buffer, analysis_result['analysis_id'])
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to analyze and generate report: {str(e)}")
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # Only needed when run directly; deployments start the app via the uvicorn CLI
+    import uvicorn
+    # One worker per core for the CPU-bound analysis; excess connections get a 503 instead of queueing.
+    # The count is exported so each worker sizes its PDF pool to its share of the cores
+    workers = int(os.environ.setdefault("WEB_CONCURRENCY", str(os.cpu_count())))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=int(os.getenv("LIMIT_CONCURRENCY", 256)),
+        log_level="warning"
+    )
@@ -1,97 +1,322 @@
-from reportlab.lib.pagesizes import letter, A4
+from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 from io import BytesIO
-from datetime import datetime
-from typing import Dict, List, Any
-import json
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+from html import escape
+from collections import Counter, OrderedDict, defaultdict
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, List, Any, Optional
+import asyncio
+import hashlib
+import os
+import threading
+import orjson
+from reportlab_accel import check_rl_accel
+
+check_rl_accel()
+
+def _build_styles() -> StyleSheet1:
+    """Build the sample stylesheet plus the report's custom paragraph styles"""
+    styles = getSampleStyleSheet()
+    
+    # Title style
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        textColor=colors.darkblue
+    ))
+    
+    # Section header style
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading2'],
+        fontSize=16,
+        spaceAfter=12,
+        spaceBefore=20,
+        textColor=colors.darkblue
+    ))
+    
+    # Risk item style
+    styles.add(ParagraphStyle(
+        name='RiskItem',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=6,
+        leftIndent=20
+    ))
+    
+    # Summary style
+    styles.add(ParagraphStyle(
+        name='Summary',
+        parent=styles['Normal'],
+        fontSize=12,
+        spaceAfter=12,
+        alignment=TA_JUSTIFY
+    ))
+    
+    # Wrapped text inside risk tables
+    styles.add(ParagraphStyle(
+        name='RiskCell',
+        parent=styles['Normal'],
+        fontSize=9,
+        leading=11
+    ))
+    
+    return styles
+
+@lru_cache(maxsize=4)
+def _format_report_date(day: int) -> str:
+    """Format a proleptic Gregorian ordinal as the report date; runs once per day"""
+    return date.fromordinal(day).strftime("%B %d, %Y")
+
+@lru_cache(maxsize=4096)
+def escape_markup(text: str) -> str:
+    """Escape analysis text before it is embedded in Paragraph markup"""
+    # Descriptions and recommendations repeat across risks and reports, so each is escaped once
+    return escape(text)
+
+RISK_COLOR_MAP = {
+    'critical': 'red',
+    'high': 'orange',
+    'medium': 'yellow',
+    'low': 'green',
+    'minimal': 'blue'
+}
+
+# Styles are never modified after this, so every generator shares one stylesheet
+_SHARED_STYLES = _build_styles()
+
+# Every table row holds a single line of text: 12pt leading plus 3pt top and 6pt bottom padding
+TABLE_ROW_HEIGHT = 21
+
+_DOC_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+])
+
+# The findings table always has the same rows; only the counts change per report
+FINDINGS_TABLE_HEADER = ["Risk Category", "Count", "Severity"]
+FINDINGS_TABLE_ROWS = (
+    ("High Risk Items", "Critical"),
+    ("Medium Risk Items", "Moderate"),
+    ("Low Risk Items", "Minor"),
+    ("Compliance Issues", "Review Required"),
+)
+FINDINGS_TABLE_COL_WIDTHS = [2.5*inch, 1*inch, 2.5*inch]
+FINDINGS_TABLE_ROW_HEIGHTS = [TABLE_ROW_HEIGHT] * (len(FINDINGS_TABLE_ROWS) + 1)
+
+_FINDINGS_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+])
+
+_META_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+])
+
+RISK_TABLE_HEADER = ["Severity", "Description", "Recommendation", "Score", "Amount"]
+RISK_TABLE_COL_WIDTHS = [0.8*inch, 1.6*inch, 2.4*inch, 0.5*inch, 0.7*inch]
+
+COMPLIANCE_TABLE_HEADER = ["Status", "Description", "Recommendation", "Weight"]
+COMPLIANCE_TABLE_COL_WIDTHS = [0.8*inch, 1.9*inch, 2.6*inch, 0.7*inch]
+
+_RISK_TABLE_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+])
+
+# Overall recommendation for each risk score band, split at these thresholds
+OVERALL_RECOMMENDATION_THRESHOLDS = (5, 10, 15, 20)
+OVERALL_RECOMMENDATIONS = tuple(f"<b>Overall Recommendation:</b><br/>{text}" for text in (
+    "MINIMAL RISK: This contract appears to have standard terms and low risk profile.",
+    "LOW RISK: This contract contains minor risks that should be reviewed but may be acceptable with minor modifications.",
+    "MODERATE CONCERN: This contract contains moderate risks that should be reviewed by legal counsel.",
+    "HIGH PRIORITY: This contract contains significant risks that require legal review before signing.",
+    "IMMEDIATE ACTION REQUIRED: This contract contains critical risks that require immediate legal review before any consideration of signing.",
+))
+
+@dataclass(frozen=True, slots=True)
+class RiskFinding:
+    """The fields of one analysed risk that the report renders"""
+    category: str
+    severity: str
+    description: str
+    recommendation: str
+    risk_score: int
+    monetary_value: Optional[str]
+    
+    @classmethod
+    def from_dict(cls, risk: Dict[str, Any]) -> "RiskFinding":
+        return cls(
+            category=risk.get('category', 'Unknown'),
+            severity=risk.get('severity', 'unknown'),
+            description=risk.get('description', 'No description'),
+            recommendation=risk.get('recommendation', ''),
+            risk_score=risk.get('risk_score', 0),
+            monetary_value=risk.get('monetary_value')
+        )
+
+# ReportLab holds the GIL for the whole build, so async callers render in worker processes
+_PDF_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+PDF_STREAM_CHUNK_SIZE = 64 * 1024
+
+def build_pdf_report(analysis_data: Dict[str, Any], filename: str) -> bytes:
+    """Build one PDF report; module-level so it can run in a worker process"""
+    # Caching happens in the calling process, where repeat requests arrive
+    return REPORT_GEN._render_pdf(analysis_data, filename)
+
+# Finished PDFs keyed on their inputs (LRU); re-downloads of the same analysis skip the build
+PDF_CACHE_SIZE = 128
+_PDF_CACHE: "OrderedDict[str, bytes]" = OrderedDict()
+_PDF_CACHE_LOCK = threading.Lock()
+
+def pdf_cache_key(analysis_data: Dict[str, Any], filename: str) -> str:
+    """Build a stable cache key from everything the rendered report depends on"""
+    payload = orjson.dumps(analysis_data, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    # The title page carries the generation date, so a new day means a new report
+    day = date.today().toordinal()
+    return hashlib.blake2b(payload + f"|{filename}|{day}".encode(), digest_size=16).hexdigest()
+
+def _get_cached_pdf(cache_key: str) -> Optional[bytes]:
+    with _PDF_CACHE_LOCK:
+        pdf_bytes = _PDF_CACHE.get(cache_key)
+        if pdf_bytes is not None:
+            _PDF_CACHE.move_to_end(cache_key)
+        return pdf_bytes
+
+def _cache_pdf(cache_key: str, pdf_bytes: bytes) -> None:
+    with _PDF_CACHE_LOCK:
+        _PDF_CACHE[cache_key] = pdf_bytes
+        _PDF_CACHE.move_to_end(cache_key)
+        if len(_PDF_CACHE) > PDF_CACHE_SIZE:
+            _PDF_CACHE.popitem(last=False)
 
 class ContractReportGenerator:
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        self.styles = _SHARED_STYLES
     
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles for the report"""
-        # Title style
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            textColor=colors.darkblue
-        ))
-        
-        # Section header style
-        self.styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            spaceAfter=12,
-            spaceBefore=20,
-            textColor=colors.darkblue
-        ))
-        
-        # Risk item style
-        self.styles.add(ParagraphStyle(
-            name='RiskItem',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            spaceAfter=6,
-            leftIndent=20
-        ))
-        
-        # Summary style
-        self.styles.add(ParagraphStyle(
-            name='Summary',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            spaceAfter=12,
-            alignment=TA_JUSTIFY
-        ))
-
     def generate_pdf_report(self, analysis_data: Dict[str, Any], filename: str) -> BytesIO:
         """Generate a comprehensive PDF report"""
+        cache_key = pdf_cache_key(analysis_data, filename)
+        pdf_bytes = _get_cached_pdf(cache_key)
+        if pdf_bytes is None:
+            pdf_bytes = self._render_pdf(analysis_data, filename)
+            _cache_pdf(cache_key, pdf_bytes)
+        return BytesIO(pdf_bytes)
+
+    def _render_pdf(self, analysis_data: Dict[str, Any], filename: str) -> bytes:
+        """Lay out and render the PDF report, bypassing the cache"""
+        # ReportLab assembles the whole PDF in memory and writes it in a single call,
+        # so the buffer is allocated once at its final size and needs no pre-sizing
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
         
+        # Read each risk dict once; the sections below use attribute access
+        risks = [RiskFinding.from_dict(risk) for risk in analysis_data.get('risks', [])]
+        
         story = []
         
         # Title page
-        story.extend(self._create_title_page(analysis_data, filename))
+        self._create_title_page(analysis_data, filename, story)
         story.append(PageBreak())
         
         # Executive Summary
-        story.extend(self._create_executive_summary(analysis_data))
+        self._create_executive_summary(analysis_data, risks, story)
         story.append(PageBreak())
         
-        # Risk Analysis
-        story.extend(self._create_risk_analysis(analysis_data))
-        story.append(PageBreak())
+        # Empty risk/compliance sections are skipped rather than laid out as placeholder pages
+        if risks:
+            # Risk Analysis
+            self._create_risk_analysis(risks, story)
+            story.append(PageBreak())
         
-        # Compliance Analysis
-        story.extend(self._create_compliance_analysis(analysis_data))
-        story.append(PageBreak())
+        compliance = analysis_data.get('compliance', [])
+        if compliance:
+            # Compliance Analysis
+            self._create_compliance_analysis(compliance, story)
+            story.append(PageBreak())
         
         # Recommendations
-        story.extend(self._create_recommendations(analysis_data))
+        self._create_recommendations(analysis_data, risks, story)
         story.append(PageBreak())
         
         # Technical Details
-        story.extend(self._create_technical_details(analysis_data))
+        self._create_technical_details(analysis_data, story)
         
+        # SimpleDocTemplate.build lays the story out in a single pass. Keep it that way: a
+        # TableOfContents or other page-number-dependent flowable needs multiBuild, which
+        # re-flows the whole report two or three times. Compute such fields up front instead.
         doc.build(story)
-        buffer.seek(0)
-        return buffer
+        return buffer.getvalue()
 
-    def _create_title_page(self, analysis_data: Dict[str, Any], filename: str) -> List:
+    async def generate_pdf_report_async(self, analysis_data: Dict[str, Any], filename: str) -> BytesIO:
+        """Generate the PDF report in the process pool without blocking the event loop"""
+        return BytesIO(await self._pdf_bytes_async(analysis_data, filename))
+
+    async def generate_pdf_stream(self, analysis_data: Dict[str, Any], filename: str) -> AsyncIterator[memoryview]:
+        """Generate the PDF report in the process pool and yield it in PDF_STREAM_CHUNK_SIZE pieces"""
+        # ReportLab only emits the file once the whole document is laid out (a single write at
+        # the end of doc.build), so the earliest byte is available when the build finishes.
+        # Chunks are zero-copy views over that one buffer.
+        view = memoryview(await self._pdf_bytes_async(analysis_data, filename))
+        for offset in range(0, len(view), PDF_STREAM_CHUNK_SIZE):
+            yield view[offset:offset + PDF_STREAM_CHUNK_SIZE]
+
+    async def _pdf_bytes_async(self, analysis_data: Dict[str, Any], filename: str) -> bytes:
+        """Return cached PDF bytes, or render them in the process pool and cache the result"""
+        cache_key = pdf_cache_key(analysis_data, filename)
+        pdf_bytes = _get_cached_pdf(cache_key)
+        if pdf_bytes is None:
+            loop = asyncio.get_running_loop()
+            pdf_bytes = await loop.run_in_executor(_PDF_POOL, build_pdf_report, analysis_data, filename)
+            _cache_pdf(cache_key, pdf_bytes)
+        return pdf_bytes
+
+    def _text_cells(self) -> Callable[[str], Paragraph]:
+        """Return a table-cell factory that parses each distinct text into a Paragraph once"""
+        # Pattern-detected findings of one type share their description and recommendation,
+        # so most cells in a section repeat the same few texts
+        paragraphs = {}
+        
+        def cell(text: str) -> Paragraph:
+            if text not in paragraphs:
+                paragraphs[text] = Paragraph(escape_markup(text), self.styles['RiskCell'])
+            return paragraphs[text]
+        
+        return cell
+
+    def _create_title_page(self, analysis_data: Dict[str, Any], filename: str, story: List) -> None:
         """Create the title page"""
-        story = []
-        
         # Title
         title = Paragraph("Contract Risk Analysis Report", self.styles['CustomTitle'])
         story.append(title)
@@ -100,22 +325,15 @@ class ContractReportGenerator:
         # Document info
         doc_info = [
             ["Document Analyzed:", filename],
-            ["Analysis Date:", datetime.now().strftime("%B %d, %Y")],
+            ["Analysis Date:", _format_report_date(date.today().toordinal())],
             ["Risk Level:", analysis_data.get('risk_level', 'UNKNOWN')],
             ["Risk Score:", f"{analysis_data.get('risk_score', 0)}/30"],
             ["Total Risks Found:", str(len(analysis_data.get('risks', [])))],
             ["Compliance Issues:", str(len(analysis_data.get('compliance', [])))]
         ]
         
-        doc_table = Table(doc_info, colWidths=[2*inch, 4*inch])
-        doc_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ]))
+        doc_table = Table(doc_info, colWidths=[2*inch, 4*inch], rowHeights=[TABLE_ROW_HEIGHT] * len(doc_info))
+        doc_table.setStyle(_DOC_TABLE_STYLE)
         
         story.append(doc_table)
         story.append(Spacer(1, 30))
@@ -129,13 +347,9 @@ class ContractReportGenerator:
             self.styles['Summary']
         )
         story.append(risk_indicator)
-        
-        return story
 
-    def _create_executive_summary(self, analysis_data: Dict[str, Any]) -> List:
+    def _create_executive_summary(self, analysis_data: Dict[str, Any], risks: List[RiskFinding], story: List) -> None:
         """Create executive summary section"""
-        story = []
-        
         # Section header
         story.append(Paragraph("Executive Summary", self.styles['SectionHeader']))
         story.append(Spacer(1, 12))
@@ -146,163 +360,116 @@ class ContractReportGenerator:
         story.append(Spacer(1, 12))
         
         # Key findings table
-        risks = analysis_data.get('risks', [])
         compliance = analysis_data.get('compliance', [])
         
-        high_risks = [r for r in risks if r.get('severity') == 'high']
-        medium_risks = [r for r in risks if r.get('severity') == 'medium']
-        low_risks = [r for r in risks if r.get('severity') == 'low']
+        severity_counts = Counter(risk.severity for risk in risks)
         
-        findings_data = [
-            ["Risk Category", "Count", "Severity"],
-            ["High Risk Items", str(len(high_risks)), "Critical"],
-            ["Medium Risk Items", str(len(medium_risks)), "Moderate"],
-            ["Low Risk Items", str(len(low_risks)), "Minor"],
-            ["Compliance Issues", str(len(compliance)), "Review Required"]
-        ]
+        counts = (severity_counts['high'], severity_counts['medium'], severity_counts['low'], len(compliance))
+        findings_data = [FINDINGS_TABLE_HEADER]
+        findings_data.extend([label, str(count), severity] for (label, severity), count in zip(FINDINGS_TABLE_ROWS, counts))
         
-        findings_table = Table(findings_data, colWidths=[2.5*inch, 1*inch, 2.5*inch])
-        findings_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
+        findings_table = Table(findings_data, colWidths=FINDINGS_TABLE_COL_WIDTHS, rowHeights=FINDINGS_TABLE_ROW_HEIGHTS)
+        findings_table.setStyle(_FINDINGS_TABLE_STYLE)
         
         story.append(findings_table)
-        
-        return story
 
-    def _create_risk_analysis(self, analysis_data: Dict[str, Any]) -> List:
+    def _create_risk_analysis(self, risks: List[RiskFinding], story: List) -> None:
         """Create detailed risk analysis section"""
-        story = []
-        
         story.append(Paragraph("Detailed Risk Analysis", self.styles['SectionHeader']))
         story.append(Spacer(1, 12))
         
-        risks = analysis_data.get('risks', [])
-        
-        if not risks:
-            story.append(Paragraph("No significant risks detected in this contract.", self.styles['Summary']))
-            return story
-        
         # Group risks by category
-        risk_categories = {}
+        risk_categories = defaultdict(list)
         for risk in risks:
-            category = risk.get('category', 'Unknown')
-            if category not in risk_categories:
-                risk_categories[category] = []
-            risk_categories[category].append(risk)
+            risk_categories[risk.category].append(risk)
+        
+        cell = self._text_cells()
         
         for category, category_risks in risk_categories.items():
             # Category header
-            story.append(Paragraph(f"<b>{category}</b>", self.styles['SectionHeader']))
+            story.append(Paragraph(f"<b>{escape_markup(category)}</b>", self.styles['SectionHeader']))
             story.append(Spacer(1, 6))
             
-            for risk in category_risks:
-                severity = risk.get('severity', 'unknown')
-                severity_color = self._get_risk_color(severity)
-                
-                risk_text = f"""
-                <b>Severity:</b> <font color='{severity_color}'>{severity.upper()}</font><br/>
-                <b>Description:</b> {risk.get('description', 'No description')}<br/>
-                <b>Recommendation:</b> {risk.get('recommendation', 'No recommendation')}<br/>
-                <b>Risk Score:</b> {risk.get('risk_score', 0)}<br/>
-                """
-                
-                if risk.get('monetary_value'):
-                    risk_text += f"<b>Monetary Value:</b> {risk['monetary_value']}<br/>"
-                
-                story.append(Paragraph(risk_text, self.styles['RiskItem']))
-                story.append(Spacer(1, 6))
-        
-        return story
-
-    def _create_compliance_analysis(self, analysis_data: Dict[str, Any]) -> List:
+            # One table per category instead of a marked-up Paragraph per risk
+            rows = [RISK_TABLE_HEADER]
+            severity_colors = []
+            for row, risk in enumerate(category_risks, 1):
+                rows.append([
+                    risk.severity.upper(),
+                    cell(risk.description),
+                    cell(risk.recommendation or 'No recommendation'),
+                    str(risk.risk_score),
+                    risk.monetary_value or '-'
+                ])
+                severity_colors.append(('TEXTCOLOR', (0, row), (0, row), self._get_risk_color(risk.severity)))
+            
+            risk_table = Table(rows, colWidths=RISK_TABLE_COL_WIDTHS, repeatRows=1)
+            risk_table.setStyle(_RISK_TABLE_STYLE)
+            risk_table.setStyle(TableStyle(severity_colors))
+            
+            story.append(risk_table)
+            story.append(Spacer(1, 6))
+
+    def _create_compliance_analysis(self, compliance: List[Dict[str, Any]], story: List) -> None:
         """Create compliance analysis section"""
-        story = []
-        
         story.append(Paragraph("Compliance Analysis", self.styles['SectionHeader']))
         story.append(Spacer(1, 12))
         
-        compliance = analysis_data.get('compliance', [])
-        
-        if not compliance:
-            story.append(Paragraph("No specific compliance issues identified.", self.styles['Summary']))
-            return story
-        
         # Group by regulation
-        compliance_by_regulation = {}
+        compliance_by_regulation = defaultdict(list)
         for item in compliance:
-            regulation = item.get('regulation', 'Unknown')
-            if regulation not in compliance_by_regulation:
-                compliance_by_regulation[regulation] = []
-            compliance_by_regulation[regulation].append(item)
+            compliance_by_regulation[item.get('regulation', 'Unknown')].append(item)
+        
+        cell = self._text_cells()
         
         for regulation, items in compliance_by_regulation.items():
-            story.append(Paragraph(f"<b>{regulation}</b>", self.styles['SectionHeader']))
+            story.append(Paragraph(f"<b>{escape_markup(regulation)}</b>", self.styles['SectionHeader']))
             story.append(Spacer(1, 6))
             
-            for item in items:
-                compliance_text = f"""
-                <b>Status:</b> {item.get('status', 'Unknown')}<br/>
-                <b>Description:</b> {item.get('description', 'No description')}<br/>
-                <b>Recommendation:</b> {item.get('recommendation', 'No recommendation')}<br/>
-                <b>Weight:</b> {item.get('weight', 0)}<br/>
-                """
-                
-                story.append(Paragraph(compliance_text, self.styles['RiskItem']))
-                story.append(Spacer(1, 6))
-        
-        return story
-
-    def _create_recommendations(self, analysis_data: Dict[str, Any]) -> List:
+            # Same layout as the risk tables, so repeated requirements share parsed cells
+            rows = [COMPLIANCE_TABLE_HEADER]
+            rows.extend(
+                [
+                    item.get('status', 'Unknown'),
+                    cell(item.get('description', 'No description')),
+                    cell(item.get('recommendation', 'No recommendation')),
+                    str(item.get('weight', 0))
+                ]
+                for item in items
+            )
+            
+            compliance_table = Table(rows, colWidths=COMPLIANCE_TABLE_COL_WIDTHS, repeatRows=1)
+            compliance_table.setStyle(_RISK_TABLE_STYLE)
+            
+            story.append(compliance_table)
+            story.append(Spacer(1, 6))
+
+    def _create_recommendations(self, analysis_data: Dict[str, Any], risks: List[RiskFinding], story: List) -> None:
         """Create recommendations section"""
-        story = []
-        
         story.append(Paragraph("Recommendations", self.styles['SectionHeader']))
         story.append(Spacer(1, 12))
         
-        risk_level = analysis_data.get('risk_level', 'UNKNOWN')
+        # Overall recommendation based on risk score
         risk_score = analysis_data.get('risk_score', 0)
+        overall_rec = OVERALL_RECOMMENDATIONS[bisect_right(OVERALL_RECOMMENDATION_THRESHOLDS, risk_score)]
         
-        # Overall recommendation based on risk level
-        if risk_score >= 20:
-            overall_rec = "IMMEDIATE ACTION REQUIRED: This contract contains critical risks that require immediate legal review before any consideration of signing."
-        elif risk_score >= 15:
-            overall_rec = "HIGH PRIORITY: This contract contains significant risks that require legal review before signing."
-        elif risk_score >= 10:
-            overall_rec = "MODERATE CONCERN: This contract contains moderate risks that should be reviewed by legal counsel."
-        elif risk_score >= 5:
-            overall_rec = "LOW RISK: This contract contains minor risks that should be reviewed but may be acceptable with minor modifications."
-        else:
-            overall_rec = "MINIMAL RISK: This contract appears to have standard terms and low risk profile."
-        
-        story.append(Paragraph(f"<b>Overall Recommendation:</b><br/>{overall_rec}", self.styles['Summary']))
+        story.append(Paragraph(overall_rec, self.styles['Summary']))
         story.append(Spacer(1, 12))
         
         # Specific recommendations from risks
-        risks = analysis_data.get('risks', [])
         if risks:
             story.append(Paragraph("<b>Specific Recommendations:</b>", self.styles['Summary']))
             story.append(Spacer(1, 6))
             
-            # Get unique recommendations
-            recommendations = list(set([r.get('recommendation', '') for r in risks if r.get('recommendation')]))
+            # Get unique recommendations, in the order the risks were found
+            recommendations = list(dict.fromkeys(risk.recommendation for risk in risks if risk.recommendation))
             
             for i, rec in enumerate(recommendations, 1):
-                story.append(Paragraph(f"{i}. {rec}", self.styles['RiskItem']))
+                story.append(Paragraph(f"{i}. {escape_markup(rec)}", self.styles['RiskItem']))
                 story.append(Spacer(1, 3))
-        
-        return story
 
-    def _create_technical_details(self, analysis_data: Dict[str, Any]) -> List:
+    def _create_technical_details(self, analysis_data: Dict[str, Any], story: List) -> None:
         """Create technical details section"""
-        story = []
-        
         story.append(Paragraph("Technical Analysis Details", self.styles['SectionHeader']))
         story.append(Spacer(1, 12))
         
@@ -318,27 +485,15 @@ class ContractReportGenerator:
             ["Compliance Regulations", "GDPR, SOX, HIPAA, CCPA"]
         ]
         
-        meta_table = Table(metadata, colWidths=[2.5*inch, 4*inch])
-        meta_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ]))
+        meta_table = Table(metadata, colWidths=[2.5*inch, 4*inch], rowHeights=[TABLE_ROW_HEIGHT] * len(metadata))
+        meta_table.setStyle(_META_TABLE_STYLE)
         
         story.append(meta_table)
-        
-        return story
 
     def _get_risk_color(self, risk_level: str) -> str:
         """Get color for risk level"""
-        colors_map = {
-            'critical': 'red',
-            'high': 'orange',
-            'medium': 'yellow',
-            'low': 'green',
-            'minimal': 'blue'
-        }
-        return colors_map.get(risk_level.lower(), 'black') 
\ No newline at end of file
+        return RISK_COLOR_MAP.get(risk_level.lower(), 'black')
+
+# The generator holds no per-report state (styles are shared, flowables are built per call),
+# so one instance serves every caller and thread
+REPORT_GEN = ContractReportGenerator()
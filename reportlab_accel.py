@@ -0,0 +1,15 @@
+"""
+Detection of ReportLab's optional C accelerators (the rl_accel package)
+"""
+
+from functools import lru_cache
+from importlib.util import find_spec
+
+@lru_cache(maxsize=1)
+def check_rl_accel() -> bool:
+    """Report whether ReportLab can use its C accelerators, warning once per process if not"""
+    # ReportLab imports _rl_accel by itself when it is installed; only its presence needs checking
+    available = find_spec("_rl_accel") is not None
+    if not available:
+        print("[WARNING] rl_accel is not installed; ReportLab will use its slower pure-Python helpers")
+    return available
@@ -4,10 +4,12 @@ Test script to verify Hugging Face integration
 """
 
 import asyncio
-import os
-import requests
+from http_session import pooled_session
 from enhanced_analysis import EnhancedContractAnalyzer
 
+# One pooled session so repeated calls reuse the TCP/TLS connection
+SESSION = pooled_session()
+
 async def test_huggingface_integration():
     """Test Hugging Face integration"""
     
@@ -71,8 +73,9 @@ async def test_huggingface_integration():
     # Test 3: Test AI-powered analysis with fallback
     print("🧠 Testing AI-Powered Analysis with Fallback...")
     try:
-        risks, risk_score = await analyzer.analyze_risks_with_ai(test_content)
+        risks, risk_score, used_ai = await analyzer.analyze_risks_with_ai(test_content)
         print("✅ AI analysis completed!")
+        print(f"   Source: {'LLM' if used_ai else 'pattern matching fallback'}")
         print(f"   Risk Score: {risk_score}")
         print(f"   Risks Found: {len(risks)}")
         
@@ -130,7 +133,7 @@ def test_api_endpoint():
     }
     
     try:
-        response = requests.post(url, json=test_data, timeout=30)
+        response = SESSION.post(url, json=test_data, timeout=30)
         
         if response.status_code == 200:
             result = response.json()
@@ -6,7 +6,10 @@ Run this to check if your API key is working correctly
 
 import os
 import requests
-import json
+from http_session import pooled_session
+
+# One pooled session so repeated calls reuse the TCP/TLS connection
+SESSION = pooled_session()
 
 def test_huggingface_api():
     """Test Hugging Face API connection"""
@@ -43,7 +46,7 @@ def test_huggingface_api():
     
     try:
         print(f"🔄 Testing connection to {model_name}...")
-        response = requests.post(
+        response = SESSION.post(
             f"https://api-inference.huggingface.co/models/{model_name}",
             headers=headers,
             json=payload,
@@ -139,7 +142,7 @@ def test_contract_analysis():
     
     try:
         print("🔄 Testing contract analysis...")
-        response = requests.post(
+        response = SESSION.post(
             "https://api-inference.huggingface.co/models/microsoft/DialoGPT-medium",
             headers=headers,
             json=payload,
@@ -149,7 +152,7 @@ def test_contract_analysis():
         if response.status_code == 200:
             print("✅ Contract analysis test successful!")
             result = response.json()
-            print(f"📝 Analysis response received")
+            print(f"📝 Analysis response received: {len(str(result))} characters")
             return True
         else:
             print(f"❌ Analysis test failed: {response.status_code}")